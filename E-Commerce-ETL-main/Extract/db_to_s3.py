@@ -1,12 +1,19 @@
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Iterator
 
 import pandas as pd
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
 
-from Load.s3_loader import upload_df_to_s3
+from Load.s3_loader import upload_chunks_to_s3, upload_df_to_s3
+
+try:
+    import connectorx as cx
+except ImportError:  # optional: fall back to pandas.read_sql_table
+    cx = None
 
 # Setup logging
 logging.basicConfig(
@@ -24,6 +31,14 @@ POSTGRES_DB = os.getenv("POSTGRES_DB", "Olist_Ecommerce")
 POSTGRES_PORT = os.getenv("POSTGRES_PORT")
 BUCKET_NAME = os.getenv("BUCKET_NAME")
 
+# Tables larger than CHUNKSIZE are streamed to S3 in chunks instead of loaded
+# whole. This bypasses connectorx, which always materializes the full result,
+# so these tables trade read speed for peak memory bounded by CHUNKSIZE. Only
+# geolocations (~1M rows) qualifies; orders (~99k) and order_items (~113k)
+# would fit in a single chunk, so they keep the connectorx path.
+STREAMED_TABLES = {"geolocations"}
+CHUNKSIZE = 200_000
+
 DATABASE_URL = (
     f"postgresql+psycopg2://{POSTGRES_USER}:"
     f"{POSTGRES_PASSWORD}@{POSTGRES_HOST}:"
@@ -31,11 +46,17 @@ DATABASE_URL = (
 )
 engine = create_engine(DATABASE_URL)
 
+# connectorx takes a plain libpq URL without the SQLAlchemy driver suffix
+CONNECTORX_URL = DATABASE_URL.replace("postgresql+psycopg2://", "postgresql://", 1)
+
 
 def extract_table(table_name: str) -> pd.DataFrame:
     """
     Extract data from the specified table in the Postgres database.
 
+    Uses connectorx when it is installed, which reads straight into Arrow
+    buffers; otherwise falls back to pandas.read_sql_table.
+
     Args:
         table_name (str): Name of the table to extract.
 
@@ -43,13 +64,56 @@ def extract_table(table_name: str) -> pd.DataFrame:
         pd.DataFrame: Extracted data as a DataFrame.
     """
     logging.info(f"Extracting data from table: {table_name}")
+    if cx is not None:
+        table = cx.read_sql(CONNECTORX_URL, f'SELECT * FROM "{table_name}"', return_type="arrow")
+        return table.to_pandas(split_blocks=True, self_destruct=True)
     df = pd.read_sql_table(table_name, engine)
     return df
 
 
+def extract_table_chunks(table_name: str, chunksize: int = CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """
+    Stream data from the specified table in chunks using a server-side cursor.
+
+    Args:
+        table_name (str): Name of the table to extract.
+        chunksize (int): Number of rows per chunk.
+
+    Yields:
+        pd.DataFrame: Successive chunks of the table.
+    """
+    logging.info(f"Streaming data from table: {table_name}")
+    with engine.connect().execution_options(stream_results=True) as conn:
+        yield from pd.read_sql(f'SELECT * FROM "{table_name}"', conn, chunksize=chunksize)
+
+
+def process_table(table_name: str) -> None:
+    """
+    Extract a single table and upload it to S3 as a Parquet file.
+
+    Args:
+        table_name (str): Name of the table to process.
+
+    Raises:
+        Exception: If the upload to S3 fails.
+    """
+    key = f"Data/{table_name}.parquet"
+    if table_name in STREAMED_TABLES:
+        success = upload_chunks_to_s3(extract_table_chunks(table_name), bucket=BUCKET_NAME, key=key)
+    else:
+        df = extract_table(table_name)
+        success = upload_df_to_s3(df, bucket=BUCKET_NAME, key=key)
+    if not success:
+        raise Exception(f"Failed to upload {table_name} to S3.")
+    logging.info(f"Successfully uploaded {table_name} to S3.")
+
+
 def main():
     """
     Main function to extract data from tables and upload them to S3 as Parquet files.
+
+    Tables are processed concurrently since both the Postgres read and the
+    S3 upload are network-bound.
     """
     table_names = (
         "customers",
@@ -63,18 +127,15 @@ def main():
         "order_payments",
     )
 
-    for table_name in table_names:
-        try:
-            df = extract_table(table_name)
-            success = upload_df_to_s3(df, bucket=BUCKET_NAME, key=f"Data/{table_name}.parquet")
-            if not success:
-                raise Exception(f"Failed to upload {table_name} to S3.")
-            logging.info(f"Successfully uploaded {table_name} to S3.")
-        except Exception as e:
-            logging.error(f"Error processing table {table_name}: {e}")
-            # Optional: Decide whether to continue or exit
-            # For now, continue with other tables
-            continue
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {executor.submit(process_table, name): name for name in table_names}
+        for future in as_completed(futures):
+            table_name = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                # A failed table does not stop the others
+                logging.error(f"Error processing table {table_name}: {e}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,41 @@
+import pandas as pd
+import pyarrow as pa
+
+
+def df_to_arrow(df: pd.DataFrame) -> pa.Table:
+    """
+    Convert a DataFrame to an Arrow table with UUID-like columns cast to string.
+
+    Columns ending in "_id" that are not numeric are cast with Arrow's string
+    kernel instead of a per-cell astype(str). Object columns holding non-str
+    values (e.g. uuid.UUID from psycopg2) have no Arrow type, so only those
+    are stringified in pandas and inserted into the table separately. The
+    input DataFrame is neither modified nor copied.
+
+    Args:
+        df (pd.DataFrame): DataFrame to convert.
+
+    Returns:
+        pa.Table: Converted table without the pandas index.
+    """
+    non_str_ids = [
+        col for col in df.columns
+        if col.endswith("_id")
+        and df[col].dtype == "object"
+        and pd.api.types.infer_dtype(df[col], skipna=True) not in ("string", "empty")
+    ]
+    table = pa.Table.from_pandas(
+        df, columns=[col for col in df.columns if col not in non_str_ids], preserve_index=False
+    )
+    for col in non_str_ids:
+        table = table.add_column(df.columns.get_loc(col), col, pa.array(df[col].astype(str)))
+
+    for i, field in enumerate(table.schema):
+        if (
+            field.name.endswith("_id")
+            and field.type != pa.string()
+            and not pa.types.is_integer(field.type)
+            and not pa.types.is_floating(field.type)
+        ):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.string()))
+    return table
@@ -1,8 +1,11 @@
+import io
 import os
 from pathlib import Path
 import logging
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
 from dotenv import load_dotenv
 from sqlalchemy import (UUID, DateTime, Float, Integer, String, Text,
                         create_engine)
@@ -34,35 +37,128 @@ DATABASE_URL = (
     f"{POSTGRES_PASSWORD}@{POSTGRES_HOST}:"
     f"{POSTGRES_PORT}/{POSTGRES_DB}"
 )
-engine = create_engine(DATABASE_URL)
+
+# Nullable pandas dtypes for the Arrow types produced by read_csv_typed
+ARROW_TO_PANDAS_DTYPES = {
+    pa.int64(): pd.Int64Dtype(),
+    pa.float64(): pd.Float64Dtype(),
+    pa.string(): pd.StringDtype("pyarrow"),
+}
+
+# Batch executemany INSERTs (insertmanyvalues) and other statements (execute_batch)
+engine = create_engine(
+    DATABASE_URL,
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=10_000,
+    executemany_batch_page_size=10_000,
+    pool_pre_ping=True,
+)
+
+
+def csv_column_types(dtype: dict) -> dict:
+    """
+    Map SQLAlchemy column types to Arrow types for pyarrow's CSV reader.
+    Args:
+        dtype (dict): SQLAlchemy types for columns (classes or instances).
+    Returns:
+        dict: Column name to Arrow type; Arrow skips columns not in the CSV.
+    """
+    column_types = {}
+    for col, sql_type in (dtype or {}).items():
+        sql_class = sql_type if isinstance(sql_type, type) else type(sql_type)
+        if issubclass(sql_class, DateTime):
+            column_types[col] = pa.timestamp("s")
+        elif issubclass(sql_class, Integer):
+            column_types[col] = pa.int64()
+        elif issubclass(sql_class, Float):
+            column_types[col] = pa.float64()
+        elif issubclass(sql_class, (UUID, String)):
+            column_types[col] = pa.string()
+    return column_types
+
+
+def read_csv_typed(csv_path: Path, dtype: dict = None) -> pd.DataFrame:
+    """
+    Read a CSV with pyarrow using the SQLAlchemy types as explicit column types.
+
+    Integers, floats and strings come back as the nullable Int64, Float64 and
+    string[pyarrow] pandas dtypes. Quoted values may contain line breaks (the
+    review text does), which Arrow only accepts with newlines_in_values.
+    Args:
+        csv_path (Path): Path to the CSV file.
+        dtype (dict): Optional SQLAlchemy types for columns.
+    Returns:
+        pd.DataFrame: Parsed data.
+    """
+    table = pv.read_csv(
+        csv_path,
+        parse_options=pv.ParseOptions(newlines_in_values=True),
+        convert_options=pv.ConvertOptions(column_types=csv_column_types(dtype)),
+    )
+    return table.to_pandas(types_mapper=ARROW_TO_PANDAS_DTYPES.get)
+
+
+def copy_df_to_postgres(df: pd.DataFrame, table_name: str, conn, chunksize: int = None):
+    """
+    Bulk load a DataFrame into an existing PostgreSQL table using COPY.
+
+    Runs inside the caller's transaction; nothing is committed here.
+    Args:
+        df (pd.DataFrame): Data to load; columns must match the table.
+        table_name (str): Destination table name.
+        conn: SQLAlchemy connection with an open transaction.
+        chunksize (int): Optional number of rows per COPY batch.
+    """
+    columns = ", ".join(f'"{col}"' for col in df.columns)
+    sql = f'COPY "{table_name}" ({columns}) FROM STDIN WITH CSV'
+    step = chunksize or max(len(df), 1)
+
+    with conn.connection.cursor() as cur:
+        for start in range(0, len(df), step):
+            buffer = io.StringIO()
+            df.iloc[start:start + step].to_csv(buffer, index=False, header=False)
+            buffer.seek(0)
+            cur.copy_expert(sql, buffer)
 
 
 def load_table_from_csv(table_name: str, csv_path: Path, dtype: dict = None, 
                         if_exists: str = "replace", chunksize: int = None, 
                         additional_steps=None):
     """
-    Generic function to load a CSV into a PostgreSQL table using pandas.to_sql.
+    Generic function to load a CSV into a PostgreSQL table.
+
+    The table is created from the DataFrame schema via pandas.to_sql and
+    the rows are then bulk loaded with COPY, both in a single transaction.
     Args:
         table_name (str): Destination table name.
         csv_path (Path): Path to the CSV file.
         dtype (dict): Optional SQLAlchemy types for columns.
         if_exists (str): 'replace', 'append', or 'fail' for table existence.
-        chunksize (int): Number of rows per batch insert.
+        chunksize (int): Number of rows per COPY batch.
         additional_steps (callable): Optional function to process dataframe before load.
     """
     logging.info(f"Loading {table_name} from {csv_path}")
-    df = pd.read_csv(csv_path)
+    # Typed read: skips dtype inference and keeps strings in Arrow buffers
+    df = read_csv_typed(csv_path, dtype)
     if additional_steps:
         df = additional_steps(df)
-    df.to_sql(
-        table_name,
-        engine,
-        if_exists=if_exists,
-        index=False,
-        dtype=dtype,
-        method="multi" if chunksize else None,
-        chunksize=chunksize,
-    )
+
+    # COPY rejects "1.0" for INTEGER columns, so undo NaN-induced float upcasts
+    # in any column the typed read did not cover (e.g. ones added by additional_steps)
+    int_cols = {col: "Int64" for col, sql_type in (dtype or {}).items()
+                if sql_type is Integer and col in df.columns and df[col].dtype.kind == "f"}
+    df = df.astype(int_cols)
+
+    # Replace and load in one transaction so a failed COPY keeps the old table
+    with engine.begin() as conn:
+        df.head(0).to_sql(
+            table_name,
+            conn,
+            if_exists=if_exists,
+            index=False,
+            dtype=dtype,
+        )
+        copy_df_to_postgres(df, table_name, conn, chunksize=chunksize)
     logging.info(f"Loaded {len(df)} records into {table_name}")
 
 
@@ -1,16 +1,60 @@
-import io
 import logging
+import uuid
+from typing import Iterable, Iterator
 
-import boto3
 import pandas as pd
-from botocore.exceptions import ClientError
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import fs
+
+from Load.arrow_utils import df_to_arrow
 
 logging.basicConfig(level=logging.INFO)
 
+# Dictionary encoding followed by zstd level 3 compresses the repeated
+# city/state/category strings better than snappy at a comparable encode speed.
+COMPRESSION = "zstd"
+COMPRESSION_LEVEL = 3
+
+# Rows per parquet row group; bounds how much encoded data is held before it
+# is handed to the S3 multipart upload.
+ROW_GROUP_SIZE = 100_000
+
+
+def _write_tables_to_s3(tables: Iterator[pa.Table], bucket: str, key: str) -> None:
+    """
+    Stream Arrow tables to a single parquet object on S3.
+
+    Row groups are handed to pyarrow's S3 output stream as they are encoded,
+    which uploads them as concurrent multipart parts. The file is written to
+    a temporary key and only moved over the target key once complete, so a
+    failed write leaves any existing object untouched.
+    """
+    first = next(tables, None)
+    if first is None:
+        raise ValueError("no data to write")
+    s3 = fs.S3FileSystem()
+    path = f"{bucket}/{key}"
+    tmp_path = f"{path}.tmp-{uuid.uuid4().hex}"
+    try:
+        with s3.open_output_stream(tmp_path, metadata={"ACL": "private"}) as stream, \
+                pq.ParquetWriter(stream, first.schema, compression=COMPRESSION,
+                                 compression_level=COMPRESSION_LEVEL, use_dictionary=True) as writer:
+            writer.write_table(first, row_group_size=ROW_GROUP_SIZE)
+            for table in tables:
+                writer.write_table(table.cast(writer.schema), row_group_size=ROW_GROUP_SIZE)
+        s3.move(tmp_path, path)
+    except Exception:
+        try:
+            s3.delete_file(tmp_path)
+        except OSError:
+            pass
+        raise
+
 
 def upload_df_to_s3(df: pd.DataFrame, bucket: str, key: str) -> bool:
     """
-    Upload a DataFrame to an S3 bucket in parquet format with snappy compression.
+    Upload a DataFrame to an S3 bucket in parquet format with zstd compression.
 
     Args:
         df (pd.DataFrame): DataFrame to upload.
@@ -22,29 +66,46 @@ def upload_df_to_s3(df: pd.DataFrame, bucket: str, key: str) -> bool:
     """
     logging.info(f"Starting upload of {key} to bucket {bucket}...")
 
-    parquet_buffer = io.BytesIO()
-
-    # Convert UUID-like columns to string for parquet compatibility
-    for col in df.columns:
-        if col.endswith("_id") and df[col].dtype == "object":
-            df[col] = df[col].astype(str)
-
     try:
-        df.to_parquet(parquet_buffer, engine="pyarrow", index=False, compression="snappy")
-        parquet_buffer.seek(0)
+        # UUID-like columns are cast to string for parquet compatibility
+        table = df_to_arrow(df)
     except Exception as e:
         logging.error(f"Failed to convert DataFrame to parquet: {e}")
         return False
 
     try:
-        s3_resource = boto3.resource("s3")
-        s3_resource.Bucket(bucket).put_object(
-            Body=parquet_buffer.getvalue(),
-            Key=key,
-            ACL="private"
-        )
+        _write_tables_to_s3(iter([table]), bucket, key)
         logging.info(f"Successfully uploaded {key} to {bucket}")
         return True
-    except ClientError as e:
+    except Exception as e:
         logging.error(f"Failed to upload {key} to S3 bucket {bucket}: {e}")
         return False
+
+
+def upload_chunks_to_s3(chunks: Iterable[pd.DataFrame], bucket: str, key: str) -> bool:
+    """
+    Upload an iterable of DataFrame chunks to S3 as a single parquet file.
+
+    Each chunk is converted and uploaded as it arrives, so only one chunk
+    needs to be held in memory at a time.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): DataFrame chunks sharing the same columns.
+        bucket (str): S3 bucket name.
+        key (str): S3 object key (path + filename).
+
+    Returns:
+        bool: True if upload was successful, False otherwise.
+    """
+    logging.info(f"Starting chunked upload of {key} to bucket {bucket}...")
+
+    # UUID-like columns are cast to string for parquet compatibility
+    tables = (df_to_arrow(chunk) for chunk in chunks)
+
+    try:
+        _write_tables_to_s3(tables, bucket, key)
+        logging.info(f"Successfully uploaded {key} to {bucket}")
+        return True
+    except Exception as e:
+        logging.error(f"Failed to upload {key} to S3 bucket {bucket}: {e}")
+    return False
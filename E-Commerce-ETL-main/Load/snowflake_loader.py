@@ -3,9 +3,17 @@ from snowflake.connector.pandas_tools import write_pandas
 from pathlib import Path
 from dotenv import load_dotenv
 import os
+import tempfile
+import time
+import uuid
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import logging
 
+from Load.arrow_utils import df_to_arrow
+
 logging.basicConfig(level=logging.INFO)
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -18,6 +26,9 @@ SNOWFLAKE_WAREHOUSE = os.getenv("SNOWFLAKE_WAREHOUSE")
 SNOWFLAKE_DATABASE = os.getenv("SNOWFLAKE_DATABASE")
 SNOWFLAKE_SCHEMA = os.getenv("SNOWFLAKE_SCHEMA")
 
+# Prefix in the user stage (@~) for parquet files staged by load_dfs_to_snowflake
+STAGE_PATH = "etl_stage"
+
 # Add a helper to verify all environment vars are present
 def check_env_vars() -> bool:
     required_vars = {
@@ -36,6 +47,22 @@ def check_env_vars() -> bool:
     return True
 
 
+def connect_to_snowflake() -> snowflake.connector.SnowflakeConnection:
+    """
+    Open a Snowflake connection using the configured environment variables.
+
+    The connection can be used as a context manager and shared across calls.
+    """
+    return snowflake.connector.connect(
+        user=SNOWFLAKE_USER,
+        password=SNOWFLAKE_PASSWORD,
+        account=SNOWFLAKE_ACCOUNT,
+        warehouse=SNOWFLAKE_WAREHOUSE,
+        schema=SNOWFLAKE_SCHEMA,
+        database=SNOWFLAKE_DATABASE,
+    )
+
+
 def create_tables_in_snowflake(query: str) -> bool:
     """
     Create tables in Snowflake by executing the provided SQL query.
@@ -52,14 +79,7 @@ def create_tables_in_snowflake(query: str) -> bool:
 
     logging.info("Connecting to Snowflake to create tables...")
     try:
-        with snowflake.connector.connect(
-            user=SNOWFLAKE_USER,
-            password=SNOWFLAKE_PASSWORD,
-            account=SNOWFLAKE_ACCOUNT,
-            warehouse=SNOWFLAKE_WAREHOUSE,
-            schema=SNOWFLAKE_SCHEMA,
-            database=SNOWFLAKE_DATABASE,
-        ) as ctx:
+        with connect_to_snowflake() as ctx:
             with ctx.cursor() as cursor:
                 logging.info(f"Executing query:\n{query}")
                 cursor.execute(query)
@@ -72,11 +92,29 @@ def create_tables_in_snowflake(query: str) -> bool:
     return False
 
 
-def load_df_to_snowflake(table: str, df: pd.DataFrame) -> bool:
+def prepare_arrow_table(df: pd.DataFrame) -> pa.Table:
+    """
+    Convert a DataFrame to an Arrow table ready for Snowflake.
+
+    Converts UUID-like columns to string and localizes naive datetime columns
+    (of any timestamp unit) to UTC. The caller's df is left untouched.
+    """
+    arrow_table = df_to_arrow(df)
+    for i, field in enumerate(arrow_table.schema):
+        if pa.types.is_timestamp(field.type) and field.type.tz is None:
+            arrow_table = arrow_table.set_column(
+                i, field.name, pc.assume_timezone(arrow_table.column(i), "UTC")
+            )
+    return arrow_table
+
+
+def load_df_to_snowflake(table: str, df: pd.DataFrame,
+                         conn: snowflake.connector.SnowflakeConnection = None) -> bool:
     """
     Upload a pandas DataFrame to a Snowflake table using write_pandas.
 
     Converts UUID-like columns to string and localizes datetime columns to UTC.
+    If conn is given it is used (and left open) instead of opening a new connection.
 
     Returns True if upload successful, False otherwise.
     """
@@ -94,35 +132,136 @@ def load_df_to_snowflake(table: str, df: pd.DataFrame) -> bool:
 
     logging.info(f"Starting upload of DataFrame to Snowflake table '{table}'...")
 
-    # Convert UUID-like columns to string
-    for column in df.columns:
-        if column.endswith("_id") and df[column].dtype == "object":
-            df[column] = df[column].astype(str)
+    arrow_table = prepare_arrow_table(df)
 
-    # Localize datetime columns to UTC (if naive)
-    datetime_cols = df.select_dtypes(include=["datetime64[ns]"]).columns
-    for col in datetime_cols:
-        if df[col].dt.tz is None:
-            df[col] = df[col].dt.tz_localize("UTC")
+    # The intermediate table's buffers are released as the new frame is built
+    df = arrow_table.to_pandas(split_blocks=True, self_destruct=True)
+    del arrow_table
 
     try:
-        with snowflake.connector.connect(
-            user=SNOWFLAKE_USER,
-            password=SNOWFLAKE_PASSWORD,
-            account=SNOWFLAKE_ACCOUNT,
-            warehouse=SNOWFLAKE_WAREHOUSE,
-            schema=SNOWFLAKE_SCHEMA,
-            database=SNOWFLAKE_DATABASE,
-        ) as ctx:
-            success, nchunks, nrows, _ = write_pandas(df=df, table_name=table, conn=ctx, use_logical_type=True)
-            if success:
-                logging.info(f"Uploaded {nrows} rows in {nchunks} chunks to Snowflake table '{table}'.")
-                return True
+        if conn is not None:
+            success, nchunks, nrows, _ = write_pandas(df=df, table_name=table, conn=conn, use_logical_type=True)
+        else:
+            with connect_to_snowflake() as ctx:
+                success, nchunks, nrows, _ = write_pandas(df=df, table_name=table, conn=ctx, use_logical_type=True)
+        if success:
+            logging.info(f"Uploaded {nrows} rows in {nchunks} chunks to Snowflake table '{table}'.")
+            return True
+        else:
+            logging.error(f"write_pandas returned failure for table '{table}'.")
+    except snowflake.connector.errors.ProgrammingError as e:
+        logging.error(f"Snowflake ProgrammingError during upload: {e}")
+    except Exception as e:
+        logging.error(f"Unexpected error during upload: {e}")
+
+    return False
+
+
+def load_dfs_to_snowflake(tables: dict,
+                          conn: snowflake.connector.SnowflakeConnection = None) -> bool:
+    """
+    Upload several pandas DataFrames to Snowflake tables through one stage.
+
+    Each DataFrame is written to a local ZSTD parquet file, all files are PUT
+    to the user stage in a single parallel upload, and one COPY INTO per table
+    is then run concurrently on the warehouse. If conn is given it is used
+    (and left open) instead of opening a new connection.
+
+    Args:
+        tables (dict): Mapping of Snowflake table name to DataFrame.
+        conn: Optional open Snowflake connection.
+
+    Returns True if every table was loaded, False otherwise.
+    """
+    if not check_env_vars():
+        logging.error("Cannot upload data: environment variables missing.")
+        return False
+
+    if not tables:
+        logging.error("No DataFrames provided. Aborting upload.")
+        return False
+
+    for table, df in tables.items():
+        if not table or not isinstance(table, str):
+            logging.error("Invalid table name provided.")
+            return False
+        if df.empty:
+            logging.error(f"DataFrame for table '{table}' is empty. Aborting upload.")
+            return False
+
+    # Unique prefix so concurrent runs never COPY each other's files
+    stage = f"@~/{STAGE_PATH}/{uuid.uuid4().hex}"
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            logging.info(f"Writing {len(tables)} DataFrames to parquet in {tmp_dir}...")
+            for table, df in tables.items():
+                pq.write_table(
+                    prepare_arrow_table(df),
+                    Path(tmp_dir) / f"{table}.parquet",
+                    compression="zstd",
+                    coerce_timestamps="us",
+                    allow_truncated_timestamps=True,
+                )
+
+            if conn is not None:
+                _put_and_copy(conn, Path(tmp_dir), stage, list(tables))
             else:
-                logging.error(f"write_pandas returned failure for table '{table}'.")
+                with connect_to_snowflake() as ctx:
+                    _put_and_copy(ctx, Path(tmp_dir), stage, list(tables))
+        return True
     except snowflake.connector.errors.ProgrammingError as e:
         logging.error(f"Snowflake ProgrammingError during upload: {e}")
     except Exception as e:
         logging.error(f"Unexpected error during upload: {e}")
 
     return False
+
+
+def _put_and_copy(conn: snowflake.connector.SnowflakeConnection, local_dir: Path,
+                  stage: str, tables: list) -> None:
+    """
+    PUT every parquet file in local_dir to the stage, then COPY each into its table.
+
+    Every COPY is waited on before returning, and the stage prefix is removed
+    afterwards whether or not the PUT and COPYs succeeded.
+
+    Raises snowflake.connector.errors.ProgrammingError if the PUT or any COPY fails.
+    """
+    query_ids = {}
+    errors = []
+    try:
+        with conn.cursor() as cursor:
+            logging.info(f"Uploading parquet files to stage {stage}...")
+            cursor.execute(
+                f"PUT 'file://{local_dir.as_posix()}/*.parquet' {stage} "
+                "PARALLEL=8 AUTO_COMPRESS=FALSE OVERWRITE=TRUE"
+            )
+
+            for table in tables:
+                cursor.execute_async(
+                    f'COPY INTO "{table}" FROM {stage}/{table}.parquet '
+                    "FILE_FORMAT=(TYPE=PARQUET USE_LOGICAL_TYPE=TRUE) "
+                    "MATCH_BY_COLUMN_NAME=CASE_SENSITIVE PURGE=TRUE"
+                )
+                query_ids[table] = cursor.sfqid
+
+        # Wait for every COPY, even after a failure, so the stage is not
+        # removed from under a COPY that is still running
+        for table, query_id in query_ids.items():
+            try:
+                while conn.is_still_running(conn.get_query_status_throw_if_error(query_id)):
+                    time.sleep(1)
+                logging.info(f"Copied staged parquet into Snowflake table '{table}'.")
+            except snowflake.connector.errors.ProgrammingError as e:
+                logging.error(f"COPY INTO '{table}' failed: {e}")
+                errors.append(e)
+    finally:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f"REMOVE {stage}")
+        except Exception as e:
+            logging.error(f"Failed to remove staged files under {stage}: {e}")
+
+    if errors:
+        raise errors[0]
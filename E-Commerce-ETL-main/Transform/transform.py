@@ -1,25 +1,33 @@
 import os
 import sys
-from uuid import UUID
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import your Snowflake loading utilities (make sure Load/snowflake_loader.py exists)
-from Load.snowflake_loader import load_df_to_snowflake, create_tables_in_snowflake
+from Load.snowflake_loader import load_dfs_to_snowflake, create_tables_in_snowflake
 
+WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
 
-def extract_local(filename):
+
+def extract_local(filename, columns=None):
     """
     Load a parquet file from local Dataset/Data folder into a pandas DataFrame.
+
+    If columns is given, only those columns are read from the file.
     """
     base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Dataset", "Data"))
 
     filepath = os.path.join(base_path, filename)
     try:
         print(f"Loading {filename} from local path: {filepath}")
-        df = pd.read_parquet(filepath, engine="pyarrow")  # or engine="fastparquet"
+        with pq.ParquetFile(filepath) as parquet_file:
+            df = parquet_file.read(columns=columns, use_threads=True).to_pandas()
         print(f"Loaded {filename} successfully, shape: {df.shape}")
         return df
     except Exception as e:
@@ -27,6 +35,28 @@ def extract_local(filename):
         return None
 
 
+def validate_ids(df, columns):
+    """
+    Check that ID columns hold 32-character lowercase hex strings.
+
+    The columns are left as plain strings; the check runs as a single
+    vectorized regex on an Arrow-backed copy of each column.
+    """
+    for col in columns:
+        ids = df[col].astype("string[pyarrow]")
+        invalid = ~ids.str.match(r"^[0-9a-f]{32}$", na=False)
+        if invalid.any():
+            raise ValueError(f"Column '{col}' has {invalid.sum()} malformed ID values")
+
+
+def sequential_names(ids, prefix):
+    """
+    Build "<prefix>_<n>" labels numbering each distinct ID by first appearance.
+    """
+    codes, _ = pd.factorize(ids)
+    return prefix + "_" + pd.Series(codes + 1, index=ids.index).astype(str)
+
+
 def create_tables_in_snowflake(create_query):
     try:
         # Execute the query to create tables in Snowflake
@@ -41,65 +71,71 @@ def create_tables_in_snowflake(create_query):
 def main():
     print("Starting data extraction from local parquet files...")
 
-    # Extract all dataframes from local parquet files
-    customers_df = extract_local("olist_customers_dataset.parquet")
-    order_items_df = extract_local("olist_order_items_dataset.parquet")
-    order_payments_df = extract_local("olist_order_payments_dataset.parquet")
-    order_reviews_df = extract_local("olist_order_reviews_dataset.parquet")
-    orders_df = extract_local("olist_orders_dataset.parquet")
-    product_category_df = extract_local("product_category_name_translation.parquet")
+    # Parquet files to extract, with the columns needed from each (None reads all)
+    sources = {
+        "customers": ("olist_customers_dataset.parquet", None),
+        "order_items": ("olist_order_items_dataset.parquet", None),
+        "order_payments": ("olist_order_payments_dataset.parquet", None),
+        # Only the columns that survive into fact_orders; skips the review text columns
+        "order_reviews": (
+            "olist_order_reviews_dataset.parquet",
+            ["order_id", "review_score", "review_creation_date"],
+        ),
+        "orders": ("olist_orders_dataset.parquet", None),
+        "product_categories": ("product_category_name_translation.parquet", None),
+        "products": ("olist_products_dataset.parquet", None),
+        "sellers": ("olist_sellers_dataset.parquet", None),
+    }
 
-    products_df = extract_local("olist_products_dataset.parquet")
-    sellers_df = extract_local("olist_sellers_dataset.parquet")
+    # Extract all dataframes from local parquet files in parallel
+    with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+        futures = {
+            name: executor.submit(extract_local, filename, columns)
+            for name, (filename, columns) in sources.items()
+        }
+        dataframes = {name: future.result() for name, future in futures.items()}
 
     # Check for missing dataframes (missing or failed to load parquet)
-    dataframes = {
-        "customers": customers_df,
-        "order_items": order_items_df,
-        "order_payments": order_payments_df,
-        "order_reviews": order_reviews_df,
-        "orders": orders_df,
-        "product_categories": product_category_df,
-        "products": products_df,
-        "sellers": sellers_df,
-    }
     for name, df in dataframes.items():
         if df is None or df.empty:
             print(f"Error: {name} dataframe is missing or empty. Please check the parquet files.")
             return
 
-    
+    customers_df = dataframes["customers"]
+    order_items_df = dataframes["order_items"]
+    order_payments_df = dataframes["order_payments"]
+    order_reviews_df = dataframes["order_reviews"]
+    orders_df = dataframes["orders"]
+    product_category_df = dataframes["product_categories"]
+    products_df = dataframes["products"]
+    sellers_df = dataframes["sellers"]
 
     print("All parquet files loaded successfully.\nStarting data transformation...")
 
     # ======== Transformations ========
     # Customers
-    customers_df["customer_id"] = customers_df["customer_id"].apply(UUID)
-    customers_df["customer_unique_id"] = customers_df["customer_unique_id"].apply(UUID)
-    id_to_name = {cust_id: f"Customer_{idx + 1}" for idx, cust_id in enumerate(customers_df["customer_unique_id"].unique())}
-    customers_df["customer_name"] = customers_df["customer_unique_id"].map(id_to_name)
+    validate_ids(customers_df, ["customer_id", "customer_unique_id"])
+    customers_df["customer_name"] = sequential_names(customers_df["customer_unique_id"], "Customer")
 
     # Order Items
     order_items_df.drop(["order_items_id"], axis=1, inplace=True, errors='ignore')
     order_items_df.rename(columns={"quantity": "order_item_id"}, inplace=True)
     order_items_df["total_price"] = (order_items_df["freight_value"] + order_items_df["price"]).round().astype(int)
-    order_items_df["order_id"] = order_items_df["order_id"].apply(UUID)
-    order_items_df["product_id"] = order_items_df["product_id"].apply(UUID)
-    order_items_df["seller_id"] = order_items_df["seller_id"].apply(UUID)
+    validate_ids(order_items_df, ["order_id", "product_id", "seller_id"])
 
     # Order Payments
-    order_payments_df["order_id"] = order_payments_df["order_id"].apply(UUID)
+    validate_ids(order_payments_df, ["order_id"])
 
     # Order Reviews
-    order_reviews_df.drop(["review_comment_title", "review_comment_message"], axis=1, inplace=True, errors='ignore')
-    order_reviews_df["review_answer_timestamp"] = pd.to_datetime(order_reviews_df["review_answer_timestamp"])
-    order_reviews_df["order_id"] = order_reviews_df["order_id"].apply(UUID)
-    order_reviews_df["review_id"] = order_reviews_df["review_id"].apply(UUID)
-    order_reviews_df = order_reviews_df.sort_values("review_creation_date").drop_duplicates("order_id", keep="last")
+    validate_ids(order_reviews_df, ["order_id"])
+    # Keep the most recent review per order. review_creation_date is date-only, so a
+    # stable sort makes ties go to the last such row in file order. (A groupby
+    # max/idxmax was measured slower: string groupby max falls back to per-group code.)
+    order_reviews_df = order_reviews_df.sort_values("review_creation_date", kind="stable") \
+        .drop_duplicates("order_id", keep="last")
 
     # Orders
-    orders_df["order_id"] = orders_df["order_id"].apply(UUID)
-    orders_df["customer_id"] = orders_df["customer_id"].apply(UUID)
+    validate_ids(orders_df, ["order_id", "customer_id"])
 
     # Product Categories
     product_category_map = product_category_df.set_index("product_category_name")["product_category_name_english"].to_dict()
@@ -112,14 +148,12 @@ def main():
             "product_description_lenght": "product_description_length",
             "product_name_lenght": "product_name_length"
         }, inplace=True)
-    products_df["product_id"] = products_df["product_id"].apply(UUID)
-    id_to_product_name = {prod_id: f"Product_{idx + 1}" for idx, prod_id in enumerate(products_df["product_id"].unique())}
-    products_df["product_name"] = products_df["product_id"].map(id_to_product_name)
+    validate_ids(products_df, ["product_id"])
+    products_df["product_name"] = sequential_names(products_df["product_id"], "Product")
 
     # Sellers
-    sellers_df["seller_id"] = sellers_df["seller_id"].apply(UUID)
-    id_to_seller_name = {sel_id: f"Seller_{idx + 1}" for idx, sel_id in enumerate(sellers_df["seller_id"].unique())}
-    sellers_df["seller_name"] = sellers_df["seller_id"].map(id_to_seller_name)
+    validate_ids(sellers_df, ["seller_id"])
+    sellers_df["seller_name"] = sequential_names(sellers_df["seller_id"], "Seller")
 
     # Dimension Modeling for customers
     customer_map = customers_df.set_index("customer_id")["customer_unique_id"]
@@ -142,14 +176,19 @@ def main():
     dim_products = products_df
 
     # Date dimension table
-    dim_dates = pd.DataFrame(pd.date_range(start="2016-01-01", end="2018-12-31"), columns=["date"])
-    dim_dates["quarter"] = dim_dates.date.dt.quarter
-    dim_dates["month"] = dim_dates.date.dt.month
-    dim_dates["year"] = dim_dates.date.dt.year
-    dim_dates["week_by_year"] = dim_dates.date.dt.strftime("%W").astype(int)
-    dim_dates["day"] = dim_dates.date.dt.day
-    dim_dates["weekday"] = dim_dates.date.dt.weekday
-    dim_dates["weekday_name"] = dim_dates.date.dt.day_name()
+    dates = pa.array(pd.date_range(start="2016-01-01", end="2018-12-31"))
+    weekday = pc.day_of_week(dates)  # Monday=0
+    dim_dates = pa.table({
+        "date": dates,
+        "quarter": pc.quarter(dates),
+        "month": pc.month(dates),
+        "year": pc.year(dates),
+        # Same as strftime("%W"): weeks start on Monday, days before the first Monday are week 0
+        "week_by_year": pc.divide(pc.add(pc.subtract(pc.day_of_year(dates), weekday), 6), 7),
+        "day": pc.day(dates),
+        "weekday": weekday,
+        "weekday_name": pc.take(pa.array(WEEKDAY_NAMES), weekday),
+    }).to_pandas()
 
     print("Data transformation completed.\nCreating Snowflake tables...")
 
@@ -255,13 +294,18 @@ def main():
 
     print("Snowflake tables created successfully.\nLoading data into Snowflake...")
 
-    # Load dataframes into Snowflake tables
-    load_df_to_snowflake("FACT_ORDERS", fact_orders)
-    load_df_to_snowflake("FACT_PAYMENTS", fact_payments)
-    load_df_to_snowflake("DIM_CUSTOMERS", dim_customers)
-    load_df_to_snowflake("DIM_SELLERS", dim_sellers)
-    load_df_to_snowflake("DIM_PRODUCTS", dim_products)
-    load_df_to_snowflake("DIM_DATES", dim_dates)
+    # Load dataframes into Snowflake tables through one connection and stage
+    tables_to_load = {
+        "FACT_ORDERS": fact_orders,
+        "FACT_PAYMENTS": fact_payments,
+        "DIM_CUSTOMERS": dim_customers,
+        "DIM_SELLERS": dim_sellers,
+        "DIM_PRODUCTS": dim_products,
+        "DIM_DATES": dim_dates,
+    }
+    if not load_dfs_to_snowflake(tables_to_load):
+        print("Error: failed to load data into Snowflake.")
+        return
 
     print("Data successfully loaded into Snowflake.")
 